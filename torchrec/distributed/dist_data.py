@@ -326,31 +326,48 @@ class KJTAllToAllLengthsAwaitable(Awaitable[KJTAllToAllIndicesAwaitable]):
         dim_1 = input.stride()
         self._batch_size_per_rank: List[int] = [dim_1] * self._workers
         self._batch_size_per_rank_tensor: Optional[torch.Tensor] = None
+        self._out_lengths_per_worker: List[int] = []
         if self._workers == 1:
             return
 
+        with record_function("## all2all_data:split length ##"):
+            self._in_lengths_per_worker = _split_lengths(
+                splits, input.keys(), input.offset_per_key()
+            )
+
         if variable_batch_size:
-            batch_size_per_rank_tensor = torch.empty(
-                self._workers,
+            # the number of values sent to each rank is exchanged together with the
+            # batch size, so the number of values received from each rank does not
+            # need to be summed from the received lengths
+            batch_sizes_and_lengths = torch.empty(
+                self._workers * 2,
                 device=self._device,
-                dtype=torch.torch.int32,
+                dtype=torch.int64,
             )
-            local_batch_sizes = torch.tensor(
-                [dim_1] * self._workers,
+            local_batch_sizes_and_lengths = torch.tensor(
+                [
+                    x
+                    for in_lengths in self._in_lengths_per_worker
+                    for x in (dim_1, in_lengths)
+                ],
                 device=self._device,
-                dtype=torch.torch.int32,
+                dtype=torch.int64,
             )
             with record_function("## all2all_data: Batch size ##"):
                 dist.all_to_all_single(
-                    output=batch_size_per_rank_tensor,
-                    input=local_batch_sizes,
-                    output_split_sizes=[1] * self._workers,
-                    input_split_sizes=[1] * self._workers,
+                    output=batch_sizes_and_lengths,
+                    input=local_batch_sizes_and_lengths,
+                    output_split_sizes=[2] * self._workers,
+                    input_split_sizes=[2] * self._workers,
                     group=self._pg,
                     async_op=False,
                 )
-            self._batch_size_per_rank_tensor = batch_size_per_rank_tensor
-            self._batch_size_per_rank = batch_size_per_rank_tensor.cpu().tolist()
+            batch_sizes_and_lengths = batch_sizes_and_lengths.view(self._workers, 2)
+            self._batch_size_per_rank_tensor = batch_sizes_and_lengths[:, 0]
+            (
+                self._batch_size_per_rank,
+                self._out_lengths_per_worker,
+            ) = batch_sizes_and_lengths.t().cpu().tolist()
             self._recat = _get_recat(
                 local_split=dim_0,
                 num_splits=len(splits),
@@ -368,10 +385,6 @@ class KJTAllToAllLengthsAwaitable(Awaitable[KJTAllToAllIndicesAwaitable]):
             dtype=in_lengths.dtype,
         )
         self._lengths = out_lengths
-        with record_function("## all2all_data:split length ##"):
-            self._in_lengths_per_worker = _split_lengths(
-                splits, input.keys(), input.offset_per_key()
-            )
 
         self._output_split_sizes: List[int] = [
             dim_0 * B_rank for B_rank in self._batch_size_per_rank
@@ -398,20 +411,7 @@ class KJTAllToAllLengthsAwaitable(Awaitable[KJTAllToAllIndicesAwaitable]):
         if self._workers > 1:
             self._lengths_awaitable.wait()
             if self._variable_batch_size:
-                with record_function("## all2all_data:split length for a2a ##"):
-                    lengths_per_rank: List[torch.Tensor] = list(
-                        self._lengths.split(self._output_split_sizes)
-                    )
-                    out_lengths_per_worker = (
-                        torch.cat(
-                            [
-                                length.sum(keepdim=True, dim=0)
-                                for length in lengths_per_rank
-                            ],
-                        )
-                        .cpu()
-                        .tolist()
-                    )
+                out_lengths_per_worker = self._out_lengths_per_worker
             else:
                 out_lengths_per_worker = (
                     self._lengths.view(self._workers, -1).sum(dim=1).cpu().tolist()
@@ -813,8 +813,6 @@ class PooledEmbeddingsReduceScatter(nn.Module):
             PooledEmbeddingsAwaitable: awaitable of pooled embeddings of tensor of shape [batch_size, dimension].
         """
 
-        # tensor_awaitable = reduce_scatter_pooled(
-        #    list(torch.chunk(local_embs, self._pg.size(), dim=0)), self._pg)
         tensor_awaitable = reduce_scatter_base_pooled(
             local_embs, self._pg, codecs=self._codecs
         )
@@ -192,6 +192,100 @@ def bucketize_kjt_before_all2all(
     )
 
 
+def bucketize_kjt_before_all2all_fused(
+    kjts: List[KeyedJaggedTensor],
+    num_buckets: int,
+    block_sizes: torch.Tensor,
+) -> KeyedJaggedTensor:
+    """
+    Bucketizes the `values` of several KeyedJaggedTensors into `num_buckets` buckets
+    with a single bucketize kernel call, `lengths` are readjusted based on the
+    bucketization results.
+
+    The KeyedJaggedTensors are concatenated along the keyed dimension and bucketized
+    once, so the result holds, for each bucket, the features of all inputs in order.
+    If any input is weighted, unweighted inputs are padded with unit weights.
+
+    Note: This function should be used only for row-wise sharding before calling
+    `KJTAllToAll`. It does not support `output_permute` or `bucketize_pos`, use
+    `bucketize_kjt_before_all2all` for those.
+
+    Args:
+        kjts (List[KeyedJaggedTensor]): KeyedJaggedTensors to bucketize, all with the
+            same stride.
+        num_buckets (int): number of buckets to bucketize the values into.
+        block_sizes (torch.Tensor): bucket sizes for the keyed dimension of all
+            `kjts`, concatenated in order.
+
+    Returns:
+        KeyedJaggedTensor: the bucketized concatenation of `kjts`.
+    """
+
+    keys: List[str] = []
+    for kjt in kjts:
+        keys.extend(kjt.keys())
+    num_features = len(keys)
+    assert (
+        block_sizes.numel() == num_features
+    ), f"Expecting block sizes for {num_features} features, but {block_sizes.numel()} received."
+    stride = kjts[0].stride()
+    assert all(
+        kjt.stride() == stride for kjt in kjts
+    ), "Expecting all KeyedJaggedTensors to have the same stride."
+
+    values = torch.cat([kjt.values() for kjt in kjts])
+    lengths = torch.cat([kjt.lengths().view(-1) for kjt in kjts])
+    weights: Optional[torch.Tensor] = None
+    weights_dtype: Optional[torch.dtype] = None
+    for kjt in kjts:
+        kjt_weights = kjt.weights_or_none()
+        if kjt_weights is not None:
+            weights_dtype = kjt_weights.dtype
+            break
+    if weights_dtype is not None:
+        weights = torch.cat(
+            [
+                kjt.weights()
+                if kjt.weights_or_none() is not None
+                else torch.ones(
+                    kjt.values().numel(), dtype=weights_dtype, device=values.device
+                )
+                for kjt in kjts
+            ]
+        )
+
+    # kernel expects them to be same type, cast to avoid type mismatch
+    block_sizes_new_type = block_sizes.type(values.type())
+    (
+        bucketized_lengths,
+        bucketized_indices,
+        bucketized_weights,
+        _,
+        _,
+    ) = torch.ops.fbgemm.block_bucketize_sparse_features(
+        lengths,
+        values,
+        bucketize_pos=False,
+        sequence=False,
+        block_sizes=block_sizes_new_type,
+        my_size=num_buckets,
+        weights=weights,
+    )
+
+    return KeyedJaggedTensor(
+        # duplicate keys will be resolved by AllToAll
+        keys=keys * num_buckets,
+        values=bucketized_indices,
+        weights=bucketized_weights,
+        lengths=bucketized_lengths.view(-1),
+        offsets=None,
+        stride=stride,
+        length_per_key=None,
+        offset_per_key=None,
+        index_per_key=None,
+    )
+
+
 class SparseFeaturesAllToAll(nn.Module):
     """
     Redistributes sparse features to a `ProcessGroup` utilizing an AlltoAll collective.
@@ -7,16 +7,22 @@
 
 #!/usr/bin/env python3
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import torch
 import torch.distributed as dist
-from torchrec.distributed.dist_data import PooledEmbeddingsReduceScatterV
+from torchrec.distributed.dist_data import (
+    KJTAllToAll,
+    KJTAllToAllIndicesAwaitable,
+    PooledEmbeddingsReduceScatterV,
+)
 from torchrec.distributed.embedding_lookup import GroupedPooledEmbeddingsLookup
 from torchrec.distributed.embedding_sharding import (
     BaseEmbeddingLookup,
     BaseSparseFeaturesDist,
     bucketize_kjt_before_all2all,
+    bucketize_kjt_before_all2all_fused,
+    EmbeddingShardingInfo,
     SparseFeaturesAllToAll,
 )
 from torchrec.distributed.embedding_types import (
@@ -28,10 +34,136 @@ from torchrec.distributed.sharding.vb_sharding import (
     BaseVariableBatchEmbeddingDist,
     VariableBatchShardingContext,
 )
-from torchrec.distributed.types import Awaitable
+from torchrec.distributed.types import (
+    Awaitable,
+    CommOp,
+    QuantizedCommCodecs,
+    ShardingEnv,
+)
+from torchrec.sparse.jagged_tensor import KeyedJaggedTensor
+
+try:
+    torch.ops.load_library("//deeplearning/fbgemm/fbgemm_gpu:sparse_ops")
+    torch.ops.load_library("//deeplearning/fbgemm/fbgemm_gpu:sparse_ops_cpu")
+except OSError:
+    pass
+
+# OSS
+try:
+    import fbgemm_gpu  # @manual  # noqa
+except ImportError:
+    pass
+
+
+def _get_block_sizes_tensor(
+    hash_sizes: List[int], world_size: int, device: Optional[torch.device]
+) -> torch.Tensor:
+    """
+    Computes the int32 block sizes of row-wise sharded features on `device` with a
+    single vectorized op. For CUDA devices the tensor is staged in pinned memory and
+    copied asynchronously on the current stream, so no blocking host to device copy is
+    issued and readers on other streams must wait for the copy.
+    """
+
+    block_sizes = torch.div(
+        torch.as_tensor(hash_sizes, dtype=torch.int64) + world_size - 1,
+        world_size,
+        rounding_mode="floor",
+    ).to(torch.int32)
+    if device is None:
+        return block_sizes
+    if device.type == "cuda":
+        return block_sizes.pin_memory().to(device, non_blocking=True)
+    return block_sizes.to(device)
+
 
-torch.ops.load_library("//deeplearning/fbgemm/fbgemm_gpu:sparse_ops")
-torch.ops.load_library("//deeplearning/fbgemm/fbgemm_gpu:sparse_ops_cpu")
+class VariableBatchRwSparseFeaturesIndicesAwaitable(Awaitable[SparseFeatures]):
+    """
+    Awaitable of id list and id score list features redistributed together with a
+    single KJT AlltoAll.
+
+    Args:
+        awaitable (Awaitable[KeyedJaggedTensor]): awaitable of the redistributed
+            concatenation of id list and id score list features.
+        num_id_list_features (int): number of local id list features.
+        num_id_score_list_features (int): number of local id score list features.
+    """
+
+    def __init__(
+        self,
+        awaitable: Awaitable[KeyedJaggedTensor],
+        num_id_list_features: int,
+        num_id_score_list_features: int,
+    ) -> None:
+        super().__init__()
+        self._awaitable = awaitable
+        self._num_id_list_features = num_id_list_features
+        self._num_id_score_list_features = num_id_score_list_features
+
+    def _wait_impl(self) -> SparseFeatures:
+        """
+        Splits the redistributed features back into id list and id score list
+        features.
+
+        Returns:
+            SparseFeatures: synced sparse features.
+        """
+
+        id_list_features, id_score_list_features = self._awaitable.wait().split(
+            [self._num_id_list_features, self._num_id_score_list_features]
+        )
+        return SparseFeatures(
+            # drop the unit weights id list features were padded with
+            id_list_features=KeyedJaggedTensor(
+                keys=id_list_features.keys(),
+                values=id_list_features.values(),
+                lengths=id_list_features.lengths(),
+                stride=id_list_features.stride(),
+                length_per_key=id_list_features.length_per_key(),
+            ),
+            id_score_list_features=id_score_list_features,
+        )
+
+
+class VariableBatchRwSparseFeaturesLengthsAwaitable(
+    Awaitable[VariableBatchRwSparseFeaturesIndicesAwaitable]
+):
+    """
+    Awaitable of the lengths AlltoAll of id list and id score list features
+    redistributed together with a single KJT AlltoAll.
+
+    Args:
+        awaitable (Awaitable[KJTAllToAllIndicesAwaitable]): awaitable of sharded
+            features indices AlltoAll.
+        num_id_list_features (int): number of local id list features.
+        num_id_score_list_features (int): number of local id score list features.
+    """
+
+    def __init__(
+        self,
+        awaitable: Awaitable[KJTAllToAllIndicesAwaitable],
+        num_id_list_features: int,
+        num_id_score_list_features: int,
+    ) -> None:
+        super().__init__()
+        self._awaitable = awaitable
+        self._num_id_list_features = num_id_list_features
+        self._num_id_score_list_features = num_id_score_list_features
+
+    def _wait_impl(self) -> VariableBatchRwSparseFeaturesIndicesAwaitable:
+        """
+        Gets lengths of AlltoAll results, instantiates
+        `VariableBatchRwSparseFeaturesIndicesAwaitable` for indices AlltoAll.
+
+        Returns:
+            VariableBatchRwSparseFeaturesIndicesAwaitable.
+        """
+
+        return VariableBatchRwSparseFeaturesIndicesAwaitable(
+            awaitable=self._awaitable.wait(),
+            num_id_list_features=self._num_id_list_features,
+            num_id_score_list_features=self._num_id_score_list_features,
+        )
 
 
 class VariableBatchRwSparseFeaturesDist(BaseSparseFeaturesDist[SparseFeatures]):
@@ -52,6 +184,15 @@ class VariableBatchRwSparseFeaturesDist(BaseSparseFeaturesDist[SparseFeatures]):
         device (Optional[torch.device]): device on which buffers will be allocated.
         has_feature_processor (bool): existence of feature processor (ie. position
             weighted features).
+        fuse_features (bool): bucketize id list and id score list features with a
+            single kernel call and redistribute them with a single KJT AlltoAll. Each
+            step saves one blocking batch size AlltoAll with its device to host copy,
+            one lengths AlltoAll and one indices AlltoAll. In exchange, id list
+            features are padded with unit weights, which adds 4 bytes per id list
+            value to the weights AlltoAll. Enable it when the input dist is latency
+            bound, ie. small per rank batches or many ranks. Keep it disabled when
+            it is bandwidth bound, ie. large id list payloads. Id list features must
+            be unweighted.
     """
 
     def __init__(
@@ -63,45 +204,125 @@ class VariableBatchRwSparseFeaturesDist(BaseSparseFeaturesDist[SparseFeatures]):
         id_score_list_feature_hash_sizes: List[int],
         device: Optional[torch.device] = None,
         has_feature_processor: bool = False,
+        fuse_features: bool = False,
     ) -> None:
         super().__init__()
         self._world_size: int = pg.size()
         self._num_id_list_features = num_id_list_features
         self._num_id_score_list_features = num_id_score_list_features
-        id_list_feature_block_sizes = [
-            (hash_size + self._world_size - 1) // self._world_size
-            for hash_size in id_list_feature_hash_sizes
-        ]
-        id_score_list_feature_block_sizes = [
-            (hash_size + self._world_size - 1) // self._world_size
-            for hash_size in id_score_list_feature_hash_sizes
-        ]
-        self.register_buffer(
-            "_id_list_feature_block_sizes_tensor",
-            torch.tensor(
-                id_list_feature_block_sizes,
-                device=device,
-                dtype=torch.int32,
-            ),
+        self._has_feature_processor = has_feature_processor
+        # always None, pooled embeddings do not need to be unbucketized
+        self.unbucketize_permute_tensor: Optional[torch.Tensor] = None
+        # side streams for bucketizing id list and id score list features
+        # separately, created on first use
+        self._bucketize_streams: List[torch.cuda.streams.Stream] = []
+
+        # bucketizing into a single bucket is an identity, so it is skipped unless
+        # id list positions are needed.
+        self._is_trivial: bool = self._world_size == 1
+        # fusing only applies when both feature types are present and id list
+        # positions do not need to be bucketized.
+        self._fuse_features: bool = (
+            fuse_features
+            and self._num_id_list_features > 0
+            and self._num_id_score_list_features > 0
+            and not self._has_feature_processor
+            and not self._is_trivial
         )
-        self.register_buffer(
-            "_id_score_list_feature_block_sizes_tensor",
-            torch.tensor(
-                id_score_list_feature_block_sizes,
+        # hash sizes of each block sizes buffer, kept to rebuild the buffers when
+        # they are materialized from the meta device (see `_apply`).
+        self._block_sizes_hash_sizes: Dict[str, List[int]] = {}
+        # recorded after the asynchronous copy of the block sizes buffers, waited on by
+        # the first `forward`
+        self._block_sizes_copy_event: Optional[torch.cuda.Event] = None
+        if self._fuse_features:
+            self._register_block_sizes_buffer(
+                "_feature_block_sizes_tensor",
+                id_list_feature_hash_sizes + id_score_list_feature_hash_sizes,
+                device,
+            )
+            self._fused_dist = KJTAllToAll(
+                pg=pg,
+                splits=self._world_size
+                * [self._num_id_list_features + self._num_id_score_list_features],
                 device=device,
-                dtype=torch.int32,
-            ),
-        )
-        self._dist = SparseFeaturesAllToAll(
-            pg=pg,
-            id_list_features_per_rank=self._world_size * [self._num_id_list_features],
-            id_score_list_features_per_rank=self._world_size
-            * [self._num_id_score_list_features],
-            device=device,
-            variable_batch_size=True,
+                variable_batch_size=True,
+            )
+        else:
+            # a single bucket only needs block sizes to bucketize id list positions
+            if not self._is_trivial or self._has_feature_processor:
+                self._register_block_sizes_buffer(
+                    "_id_list_feature_block_sizes_tensor",
+                    id_list_feature_hash_sizes,
+                    device,
+                )
+            if not self._is_trivial:
+                self._register_block_sizes_buffer(
+                    "_id_score_list_feature_block_sizes_tensor",
+                    id_score_list_feature_hash_sizes,
+                    device,
+                )
+            self._dist = SparseFeaturesAllToAll(
+                pg=pg,
+                id_list_features_per_rank=self._world_size
+                * [self._num_id_list_features],
+                id_score_list_features_per_rank=self._world_size
+                * [self._num_id_score_list_features],
+                device=device,
+                variable_batch_size=True,
+            )
+        self._record_block_sizes_copy(device)
+
+    def _register_block_sizes_buffer(
+        self, name: str, hash_sizes: List[int], device: Optional[torch.device]
+    ) -> None:
+        self._block_sizes_hash_sizes[name] = hash_sizes
+        self.register_buffer(
+            name,
+            _get_block_sizes_tensor(hash_sizes, self._world_size, device),
+            persistent=False,
         )
-        self._has_feature_processor = has_feature_processor
-        self.unbucketize_permute_tensor: Optional[torch.Tensor] = None
+
+    def _record_block_sizes_copy(self, device: Optional[torch.device]) -> None:
+        """
+        Records an event after the asynchronous host to device copy of the block sizes
+        buffers. `forward` may run on another stream than the copy (ie. the data dist
+        stream of `TrainPipelineSparseDist`), so its first call waits on the event.
+        """
+
+        if device is not None and device.type == "cuda":
+            event = torch.cuda.Event()
+            event.record(torch.cuda.current_stream(device))
+            self._block_sizes_copy_event = event
+
+    def _apply(
+        self, fn: Callable[[torch.Tensor], torch.Tensor], *args: Any, **kwargs: Any
+    ) -> "VariableBatchRwSparseFeaturesDist":
+        """
+        Block sizes buffers created on the meta device hold no data, so they can
+        neither be copied by `to()` nor be left uninitialized by `to_empty()`. Block
+        sizes buffers that are on the meta device or change device are kept out of
+        `fn` and recomputed directly on the target device, staged in pinned memory for
+        CUDA, so materializing them issues no blocking copy.
+        """
+
+        # the target device is probed with an empty tensor, so no data is copied
+        device = fn(torch.empty(0, dtype=torch.int32)).device
+        rebuilt_buffers = [
+            name
+            for name in self._block_sizes_hash_sizes
+            if self._buffers[name].is_meta or self._buffers[name].device != device
+        ]
+        for name in rebuilt_buffers:
+            del self._buffers[name]
+        super()._apply(fn, *args, **kwargs)
+        for name in rebuilt_buffers:
+            self._register_block_sizes_buffer(
+                name, self._block_sizes_hash_sizes[name], device
+            )
+        if rebuilt_buffers:
+            self._record_block_sizes_copy(device)
+        return self
 
     def forward(
         self,
@@ -119,41 +340,148 @@ class VariableBatchRwSparseFeaturesDist(BaseSparseFeaturesDist[SparseFeatures]):
             Awaitable[SparseFeatures]: awaitable of SparseFeatures.
         """
 
-        if self._num_id_list_features > 0:
+        if self._block_sizes_copy_event is not None:
+            self._block_sizes_copy_event.wait()
+            self._block_sizes_copy_event = None
+
+        if self._fuse_features:
             assert sparse_features.id_list_features is not None
-            (
-                id_list_features,
-                self.unbucketize_permute_tensor,
-            ) = bucketize_kjt_before_all2all(
-                sparse_features.id_list_features,
+            assert sparse_features.id_score_list_features is not None
+            assert (
+                sparse_features.id_list_features.weights_or_none() is None
+            ), "Expecting unweighted id list features when fusing features."
+            bucketized_features = bucketize_kjt_before_all2all_fused(
+                [
+                    sparse_features.id_list_features,
+                    sparse_features.id_score_list_features,
+                ],
                 num_buckets=self._world_size,
-                block_sizes=self._id_list_feature_block_sizes_tensor,
-                output_permute=False,
-                bucketize_pos=self._has_feature_processor,
+                block_sizes=self._feature_block_sizes_tensor,
             )
+            return VariableBatchRwSparseFeaturesLengthsAwaitable(
+                awaitable=self._fused_dist(bucketized_features),
+                num_id_list_features=self._num_id_list_features,
+                num_id_score_list_features=self._num_id_score_list_features,
+            )
+
+        id_list_features = sparse_features.id_list_features
+        id_score_list_features = sparse_features.id_score_list_features
+        if self._num_id_list_features > 0:
+            assert id_list_features is not None
         else:
             id_list_features = None
-
         if self._num_id_score_list_features > 0:
-            assert sparse_features.id_score_list_features is not None
-            id_score_list_features, _ = bucketize_kjt_before_all2all(
-                sparse_features.id_score_list_features,
-                num_buckets=self._world_size,
-                block_sizes=self._id_score_list_feature_block_sizes_tensor,
-                output_permute=False,
-                bucketize_pos=False,
-            )
+            assert id_score_list_features is not None
         else:
             id_score_list_features = None
 
+        if self._is_trivial:
+            if id_list_features is not None and self._has_feature_processor:
+                id_list_features = self._bucketize_id_list_features(id_list_features)
+        elif (
+            id_list_features is not None
+            and id_score_list_features is not None
+            and id_list_features.device().type == "cuda"
+        ):
+            (
+                id_list_features,
+                id_score_list_features,
+            ) = self._bucketize_on_side_streams(
+                id_list_features, id_score_list_features
+            )
+        else:
+            if id_list_features is not None:
+                id_list_features = self._bucketize_id_list_features(id_list_features)
+            if id_score_list_features is not None:
+                id_score_list_features = self._bucketize_id_score_list_features(
+                    id_score_list_features
+                )
+
         bucketized_sparse_features = SparseFeatures(
             id_list_features=id_list_features,
             id_score_list_features=id_score_list_features,
         )
         return self._dist(bucketized_sparse_features)
 
+    def _bucketize_id_list_features(
+        self, id_list_features: KeyedJaggedTensor
+    ) -> KeyedJaggedTensor:
+        # pooled embeddings are never unbucketized, so no permute is requested
+        bucketized_id_list_features, _ = bucketize_kjt_before_all2all(
+            id_list_features,
+            num_buckets=self._world_size,
+            block_sizes=self._id_list_feature_block_sizes_tensor,
+            output_permute=False,
+            bucketize_pos=self._has_feature_processor,
+        )
+        return bucketized_id_list_features
+
+    def _bucketize_id_score_list_features(
+        self, id_score_list_features: KeyedJaggedTensor
+    ) -> KeyedJaggedTensor:
+        bucketized_id_score_list_features, _ = bucketize_kjt_before_all2all(
+            id_score_list_features,
+            num_buckets=self._world_size,
+            block_sizes=self._id_score_list_feature_block_sizes_tensor,
+            output_permute=False,
+            bucketize_pos=False,
+        )
+        return bucketized_id_score_list_features
+
+    def _bucketize_on_side_streams(
+        self,
+        id_list_features: KeyedJaggedTensor,
+        id_score_list_features: KeyedJaggedTensor,
+    ) -> Tuple[KeyedJaggedTensor, KeyedJaggedTensor]:
+        """
+        Bucketizes id list and id score list features on two side streams, so the two
+        independent bucketize kernels can overlap.
+        """
+
+        device = id_list_features.device()
+        if not self._bucketize_streams:
+            self._bucketize_streams = [
+                torch.cuda.Stream(device=device),
+                torch.cuda.Stream(device=device),
+            ]
+        id_list_stream, id_score_list_stream = self._bucketize_streams
+        current_stream = torch.cuda.current_stream(device)
+        # lengths of offsets only inputs are computed and cached on the input on first
+        # use, compute them on the current stream rather than on a side stream
+        id_list_features.lengths()
+        id_score_list_features.lengths()
+
+        id_list_stream.wait_stream(current_stream)
+        id_list_features.record_stream(id_list_stream)
+        with torch.cuda.stream(id_list_stream):
+            id_list_features = self._bucketize_id_list_features(id_list_features)
+
+        id_score_list_stream.wait_stream(current_stream)
+        id_score_list_features.record_stream(id_score_list_stream)
+        with torch.cuda.stream(id_score_list_stream):
+            id_score_list_features = self._bucketize_id_score_list_features(
+                id_score_list_features
+            )
+
+        current_stream.wait_stream(id_list_stream)
+        current_stream.wait_stream(id_score_list_stream)
+        id_list_features.record_stream(current_stream)
+        id_score_list_features.record_stream(current_stream)
+        return id_list_features, id_score_list_features
+
 
 class VariableBatchRwEmbeddingDistAwaitable(Awaitable[torch.Tensor]):
+    """
+    Awaitable of pooled embeddings redistributed with reduce-scatter-v.
+
+    The reduce-scatter-v output only holds the rows of the current rank, so it is
+    returned as is, without narrowing a padded buffer.
+
+    Args:
+        awaitable (Awaitable[torch.Tensor]): awaitable of the reduce-scatter-v output.
+        batch_size (int): batch size of the current rank.
+    """
+
     def __init__(self, awaitable: Awaitable[torch.Tensor], batch_size: int) -> None:
         super().__init__()
         self._awaitable = awaitable
@@ -161,30 +489,70 @@ class VariableBatchRwEmbeddingDistAwaitable(Awaitable[torch.Tensor]):
 
     def _wait_impl(self) -> torch.Tensor:
         embedding = self._awaitable.wait()
+        assert (
+            embedding.size(0) == self._batch_size
+        ), f"Expecting {self._batch_size} rows, but {embedding.size(0)} received."
 
         return embedding
 
 
 class VariableBatchRwPooledEmbeddingDist(BaseVariableBatchEmbeddingDist[torch.Tensor]):
+    """
+    Redistributes pooled embedding tensor in RW fashion by performing a
+    reduce-scatter-v operation.
+
+    Supports variable batch size. The local embeddings are split along the batch
+    dimension by the batch size of each rank, so no padding to the largest batch size
+    is allocated or sent.
+
+    Args:
+        pg (dist.ProcessGroup): ProcessGroup for reduce-scatter-v communication.
+        qcomm_codecs_registry (Optional[Dict[str, QuantizedCommCodecs]]): quantized
+            communication codecs, the reduce-scatter codec is used to reduce the
+            precision (ie. BF16) of the communicated embeddings.
+    """
+
     def __init__(
         self,
         pg: dist.ProcessGroup,
+        qcomm_codecs_registry: Optional[Dict[str, QuantizedCommCodecs]] = None,
     ) -> None:
         super().__init__()
         self._workers: int = pg.size()
         self._rank: int = pg.rank()
-        self._dist = PooledEmbeddingsReduceScatterV(pg)
+        self._dist = PooledEmbeddingsReduceScatterV(
+            pg,
+            codecs=qcomm_codecs_registry.get(
+                CommOp.POOLED_EMBEDDINGS_REDUCE_SCATTER.name, None
+            )
+            if qcomm_codecs_registry
+            else None,
+        )
 
     def forward(
         self,
         local_embs: torch.Tensor,
         sharding_ctx: VariableBatchShardingContext,
     ) -> Awaitable[torch.Tensor]:
-        batch_size_per_rank = sharding_ctx.batch_size_per_rank
+        """
+        Performs reduce-scatter-v pooled operation on pooled embeddings tensor.
+
+        Args:
+            local_embs (torch.Tensor): pooled embeddings tensor to distribute.
+            sharding_ctx (VariableBatchShardingContext): shared context holding the
+                batch size of each rank.
+
+        Returns:
+            Awaitable[torch.Tensor]: awaitable of pooled embeddings tensor.
+        """
+
+        batch_size_per_rank = sharding_ctx.get_batch_size_per_rank()
         batch_size = batch_size_per_rank[self._rank]
 
+        # `reshape` returns a view whenever the strides allow it and only copies
+        # otherwise.
         awaitable_tensor = self._dist(
-            local_embs.view(sum(batch_size_per_rank), -1),
+            local_embs.reshape(sum(batch_size_per_rank), -1),
             input_splits=batch_size_per_rank,
         )
         return VariableBatchRwEmbeddingDistAwaitable(awaitable_tensor, batch_size)
@@ -197,27 +565,53 @@ class VariableBatchRwPooledEmbeddingSharding(
     Shards pooled embeddings row-wise, i.e.. a given embedding table is evenly
     distributed by rows and table slices are placed on all ranks.
 
-    Supports variable batch size.
+    Supports variable batch size. With `fuse_features`, the input dist bucketizes and
+    redistributes id list and id score list features together, see
+    `VariableBatchRwSparseFeaturesDist`.
     """
 
+    def __init__(
+        self,
+        sharding_infos: List[EmbeddingShardingInfo],
+        env: ShardingEnv,
+        device: Optional[torch.device] = None,
+        need_pos: bool = False,
+        qcomm_codecs_registry: Optional[Dict[str, QuantizedCommCodecs]] = None,
+        fuse_features: bool = False,
+    ) -> None:
+        super().__init__(
+            sharding_infos=sharding_infos,
+            env=env,
+            device=device,
+            need_pos=need_pos,
+            qcomm_codecs_registry=qcomm_codecs_registry,
+        )
+        self._fuse_features = fuse_features
+        # the input dist arguments only depend on the sharding, compute them once.
+        # A new input dist is built on each `create_input_dist` call, as its owner
+        # may move it or hold per instance state.
+        self._num_id_list_features = self._get_id_list_features_num()
+        self._num_id_score_list_features = self._get_id_score_list_features_num()
+        self._id_list_feature_hash_sizes = self._get_id_list_features_hash_sizes()
+        self._id_score_list_feature_hash_sizes = (
+            self._get_id_score_list_features_hash_sizes()
+        )
+
     def create_input_dist(
         self,
         device: Optional[torch.device] = None,
     ) -> BaseSparseFeaturesDist[SparseFeatures]:
-        num_id_list_features = self._get_id_list_features_num()
-        num_id_score_list_features = self._get_id_score_list_features_num()
-        id_list_feature_hash_sizes = self._get_id_list_features_hash_sizes()
-        id_score_list_feature_hash_sizes = self._get_id_score_list_features_hash_sizes()
         return VariableBatchRwSparseFeaturesDist(
             # pyre-fixme[6]: For 1st param expected `ProcessGroup` but got
             #  `Optional[ProcessGroup]`.
             pg=self._pg,
-            num_id_list_features=num_id_list_features,
-            num_id_score_list_features=num_id_score_list_features,
-            id_list_feature_hash_sizes=id_list_feature_hash_sizes,
-            id_score_list_feature_hash_sizes=id_score_list_feature_hash_sizes,
-            device=self._device,
+            num_id_list_features=self._num_id_list_features,
+            num_id_score_list_features=self._num_id_score_list_features,
+            id_list_feature_hash_sizes=self._id_list_feature_hash_sizes,
+            id_score_list_feature_hash_sizes=self._id_score_list_feature_hash_sizes,
+            device=device if device is not None else self._device,
             has_feature_processor=self._has_feature_processor,
+            fuse_features=self._fuse_features,
         )
 
     def create_lookup(
@@ -239,6 +633,9 @@ class VariableBatchRwPooledEmbeddingSharding(
         self,
         device: Optional[torch.device] = None,
     ) -> BaseVariableBatchEmbeddingDist[torch.Tensor]:
-        # pyre-fixme[6]: For 1st param expected `ProcessGroup` but got
-        #  `Optional[ProcessGroup]`.
-        return VariableBatchRwPooledEmbeddingDist(self._pg)
+        return VariableBatchRwPooledEmbeddingDist(
+            # pyre-fixme[6]: For 1st param expected `ProcessGroup` but got
+            #  `Optional[ProcessGroup]`.
+            self._pg,
+            qcomm_codecs_registry=self.qcomm_codecs_registry,
+        )
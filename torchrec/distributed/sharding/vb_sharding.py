@@ -7,7 +7,7 @@
 
 import abc
 from dataclasses import dataclass, field
-from typing import List, Optional, TypeVar
+from typing import List, Optional, Tuple, TypeVar
 
 import torch
 from torchrec.distributed.embedding_sharding import BaseEmbeddingDist
@@ -29,6 +29,33 @@ class VariableBatchShardingContext(Multistreamable):
 
     batch_size_per_rank: List[int] = field(default_factory=list)
     batch_size_per_rank_tensor: Optional[torch.Tensor] = None
+    # host copy of `batch_size_per_rank_tensor`, with the tensor it was copied from
+    _batch_size_per_rank_copy: Optional[Tuple[torch.Tensor, List[int]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def get_batch_size_per_rank(self) -> List[int]:
+        """
+        Returns `batch_size_per_rank`. If only `batch_size_per_rank_tensor` was
+        provided, it is copied to host once per tensor and cached, so all output dists
+        of an iteration share a single D2H copy.
+
+        Returns:
+            List[int]: batch size in each rank.
+        """
+
+        batch_size_per_rank_tensor = self.batch_size_per_rank_tensor
+        if self.batch_size_per_rank or batch_size_per_rank_tensor is None:
+            return self.batch_size_per_rank
+        if (
+            self._batch_size_per_rank_copy is None
+            or self._batch_size_per_rank_copy[0] is not batch_size_per_rank_tensor
+        ):
+            self._batch_size_per_rank_copy = (
+                batch_size_per_rank_tensor,
+                batch_size_per_rank_tensor.cpu().tolist(),
+            )
+        return self._batch_size_per_rank_copy[1]
 
     def record_stream(self, stream: torch.cuda.streams.Stream) -> None:
         if self.batch_size_per_rank_tensor is not None:
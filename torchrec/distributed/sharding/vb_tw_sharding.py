@@ -93,7 +93,7 @@ class VariableBatchTwPooledEmbeddingDist(BaseVariableBatchEmbeddingDist[torch.Te
     ) -> Awaitable[torch.Tensor]:
         # do not remove the keyword for quantized communication hook injection.
         return self._dist(
-            local_embs, batch_size_per_rank=sharding_ctx.batch_size_per_rank
+            local_embs, batch_size_per_rank=sharding_ctx.get_batch_size_per_rank()
         )
 
 
@@ -268,7 +268,7 @@ class VariableBatchTwRwPooledEmbeddingDist(
         ) = self._preprocess_batch_size_per_rank(
             self._intra_pg.size(),
             self._cross_pg.size(),
-            sharding_ctx.batch_size_per_rank,
+            sharding_ctx.get_batch_size_per_rank(),
         )
 
         # Perform ReduceScatterV within one host
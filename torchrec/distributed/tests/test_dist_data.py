@@ -82,7 +82,7 @@ def _generate_sparse_features_batch(
             for i in range(world_size)
         ]
 
-        if weights:
+        if weights is not None:
             weights[key] = [
                 [random.random() for _ in range(sum(lengths[key][i]))]
                 for i in range(world_size)
@@ -97,7 +97,7 @@ def _generate_sparse_features_batch(
                 lengths=_to_tensor([lengths[key][i] for key in keys], torch.int),
                 values=_to_tensor([values[key][i] for key in keys], torch.int),
                 weights=_to_tensor([weights[key][i] for key in keys], torch.float)
-                if weights
+                if weights is not None
                 else None,
             )
         )
@@ -121,7 +121,7 @@ def _generate_sparse_features_batch(
                     [weights[key][j] for key, j in key_index],
                     torch.float,
                 )
-                if weights
+                if weights is not None
                 else None,
             )
         )
@@ -293,6 +293,55 @@ class KJTAllToAllTest(MultiProcessTestBase):
             kwargs_per_rank=kwargs_per_rank,
         )
 
+    # pyre-fixme[56]
+    @given(
+        B=st.integers(min_value=1, max_value=2),
+        features=st.integers(min_value=3, max_value=6),
+        is_weighted=st.booleans(),
+    )
+    @settings(max_examples=4, deadline=None)
+    def test_variable_batch_size(
+        self,
+        B: int,
+        features: int,
+        is_weighted: bool,
+    ) -> None:
+        # more than two ranks with distinct batch sizes, so each rank receives a
+        # different number of rows and values from every other rank
+        world_size = 3
+        keys = [f"F{feature}" for feature in range(features)]
+        rank_splits = sorted(random.sample(range(features + 1), world_size - 1))
+        splits = [
+            end - start
+            for start, end in zip([0] + rank_splits, rank_splits + [features])
+        ]
+        batch_size_per_rank = random.sample(range(B, B + 6), world_size)
+
+        _input, output = _generate_sparse_features_batch(
+            keys=keys,
+            splits=splits,
+            batch_size_per_rank=batch_size_per_rank,
+            is_weighted=is_weighted,
+        )
+
+        kwargs_per_rank = []
+        for rank in range(world_size):
+            kwargs_per_rank.append(
+                {
+                    "_input": _input[rank],
+                    "output": output[rank],
+                    "backend": "gloo",
+                    "splits": splits,
+                    "batch_size_per_rank": batch_size_per_rank,
+                }
+            )
+
+        self._run_multi_process_test_per_rank(
+            callable=self._run_test_dist,
+            world_size=world_size,
+            kwargs_per_rank=kwargs_per_rank,
+        )
+
 
 class PooledEmbeddingsAllToAllTest(MultiProcessTestBase):
     @classmethod
@@ -16,7 +16,10 @@ import numpy as np
 import torch
 import torch.distributed as dist
 from hypothesis import given, settings, strategies as st, Verbosity
-from torchrec.distributed.embedding_sharding import bucketize_kjt_before_all2all
+from torchrec.distributed.embedding_sharding import (
+    bucketize_kjt_before_all2all,
+    bucketize_kjt_before_all2all_fused,
+)
 from torchrec.distributed.embeddingbag import EmbeddingBagCollectionSharder
 from torchrec.distributed.model_parallel import DistributedModelParallel
 from torchrec.distributed.test_utils.test_model import TestSparseNN
@@ -320,3 +323,96 @@ class KJTBucketizeTest(unittest.TestCase):
                 block_bucketized_kjt, expected_block_bucketized_kjt
             )
         )
+
+    @unittest.skipIf(
+        torch.cuda.device_count() <= 0,
+        "CUDA is not available",
+    )
+    # pyre-ignore[56]
+    @given(
+        index_type=st.sampled_from([torch.int, torch.long]),
+        world_size=st.integers(1, 129),
+        num_features=st.integers(1, 15),
+        num_weighted_features=st.integers(1, 15),
+        batch_size=st.integers(1, 15),
+    )
+    @settings(verbosity=Verbosity.verbose, max_examples=5, deadline=None)
+    def test_kjt_bucketize_before_all2all_fused(
+        self,
+        index_type: torch.dtype,
+        world_size: int,
+        num_features: int,
+        num_weighted_features: int,
+        batch_size: int,
+    ) -> None:
+        MAX_LENGTH = 10
+        MAX_ROW_COUNT = 1000
+
+        def _random_kjt(
+            prefix: str, num_features: int, weighted: bool
+        ) -> KeyedJaggedTensor:
+            lengths_list = [
+                random.randrange(MAX_LENGTH + 1)
+                for _ in range(num_features * batch_size)
+            ]
+            indices_list = [
+                random.randrange(MAX_ROW_COUNT) for _ in range(sum(lengths_list))
+            ]
+            return KeyedJaggedTensor(
+                keys=[f"{prefix}_{i}" for i in range(num_features)],
+                lengths=torch.tensor(lengths_list, dtype=torch.int).cuda(),
+                values=torch.tensor(indices_list, dtype=index_type).cuda(),
+                weights=torch.rand(len(indices_list)).cuda() if weighted else None,
+            )
+
+        kjts = [
+            _random_kjt("feature", num_features, weighted=False),
+            _random_kjt("weighted_feature", num_weighted_features, weighted=True),
+        ]
+        block_sizes_list = [
+            random.randint(1, MAX_ROW_COUNT)
+            for _ in range(num_features + num_weighted_features)
+        ]
+        block_sizes = torch.tensor(block_sizes_list, dtype=index_type).cuda()
+
+        block_bucketized_kjt = bucketize_kjt_before_all2all_fused(
+            kjts, world_size, block_sizes
+        )
+
+        # the fused output holds, for each bucket, the features of all kjts in order
+        actual_bucket_kjts = block_bucketized_kjt.split(
+            [num_features, num_weighted_features] * world_size
+        )
+        for kjt_index, (kjt, kjt_block_sizes) in enumerate(
+            zip(kjts, block_sizes.split([num_features, num_weighted_features]))
+        ):
+            expected_block_bucketized_kjt, _ = bucketize_kjt_before_all2all(
+                kjt, world_size, kjt_block_sizes, False, False
+            )
+            expected_bucket_kjts = expected_block_bucketized_kjt.split(
+                [len(kjt.keys())] * world_size
+            )
+            for bucket, expected_bucket_kjt in enumerate(expected_bucket_kjts):
+                actual_bucket_kjt = actual_bucket_kjts[bucket * len(kjts) + kjt_index]
+                self.assertEqual(actual_bucket_kjt.keys(), expected_bucket_kjt.keys())
+                self.assertTrue(
+                    torch.equal(
+                        actual_bucket_kjt.lengths(), expected_bucket_kjt.lengths()
+                    )
+                )
+                self.assertTrue(
+                    torch.equal(
+                        actual_bucket_kjt.values(), expected_bucket_kjt.values()
+                    )
+                )
+                # unweighted kjts are padded with unit weights
+                expected_weights = (
+                    expected_bucket_kjt.weights()
+                    if expected_bucket_kjt.weights_or_none() is not None
+                    else torch.ones_like(
+                        expected_bucket_kjt.values(), dtype=torch.float
+                    )
+                )
+                self.assertTrue(
+                    torch.equal(actual_bucket_kjt.weights(), expected_weights)
+                )
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+import random
+import unittest
+from typing import List
+
+import hypothesis.strategies as st
+import torch
+import torch.distributed as dist
+from hypothesis import given, settings
+from torchrec.distributed.embedding_types import SparseFeatures
+from torchrec.distributed.sharding.vb_rw_sharding import (
+    VariableBatchRwSparseFeaturesDist,
+)
+from torchrec.distributed.test_utils.multi_process import MultiProcessTestBase
+from torchrec.distributed.tests.test_dist_data import (
+    _generate_sparse_features_batch,
+    KJTAllToAllTest,
+)
+from torchrec.sparse.jagged_tensor import KeyedJaggedTensor
+from torchrec.sparse.test_utils import keyed_jagged_tensor_equals
+
+
+class VariableBatchRwSparseFeaturesDistTest(MultiProcessTestBase):
+    @classmethod
+    def _run_test_meta_init(
+        cls,
+        rank: int,
+        world_size: int,
+    ) -> None:
+        dist.init_process_group(rank=rank, world_size=world_size, backend="gloo")
+        device = torch.device("cpu")
+        id_list_feature_hash_sizes = [10, 7]
+        id_score_list_feature_hash_sizes = [5]
+        for fuse_features, expected_block_sizes in [
+            (True, {"_feature_block_sizes_tensor": [5, 4, 3]}),
+            (
+                False,
+                {
+                    "_id_list_feature_block_sizes_tensor": [5, 4],
+                    "_id_score_list_feature_block_sizes_tensor": [3],
+                },
+            ),
+        ]:
+            input_dist = VariableBatchRwSparseFeaturesDist(
+                # pyre-fixme[6]: For 1st param expected `ProcessGroup` but got
+                #  `Optional[ProcessGroup]`.
+                pg=dist.group.WORLD,
+                num_id_list_features=len(id_list_feature_hash_sizes),
+                num_id_score_list_features=len(id_score_list_feature_hash_sizes),
+                id_list_feature_hash_sizes=id_list_feature_hash_sizes,
+                id_score_list_feature_hash_sizes=id_score_list_feature_hash_sizes,
+                device=torch.device("meta"),
+                fuse_features=fuse_features,
+            )
+            for name in expected_block_sizes:
+                assert getattr(input_dist, name).is_meta
+
+            input_dist.to_empty(device=device)
+            for name, block_sizes in expected_block_sizes.items():
+                buffer = getattr(input_dist, name)
+                assert buffer.device == device
+                assert torch.equal(
+                    buffer, torch.tensor(block_sizes, dtype=torch.int32)
+                ), f"{name}: {buffer} != {block_sizes}"
+            # block sizes buffers are not checkpointed
+            assert not any(
+                name in input_dist.state_dict() for name in expected_block_sizes
+            )
+        dist.destroy_process_group()
+
+    def test_meta_init(self) -> None:
+        self._run_multi_process_test(
+            callable=self._run_test_meta_init,
+            world_size=2,
+        )
+
+    @classmethod
+    def _run_test_fused_features(
+        cls,
+        rank: int,
+        world_size: int,
+        id_list_features: KeyedJaggedTensor,
+        id_score_list_features: KeyedJaggedTensor,
+        hash_size: int,
+        backend: str,
+    ) -> None:
+        dist.init_process_group(rank=rank, world_size=world_size, backend=backend)
+        device = torch.device(f"cuda:{rank}")
+        if backend == "gloo":
+            device = torch.device("cpu")
+        sparse_features = SparseFeatures(
+            id_list_features=id_list_features.to(device=device),
+            id_score_list_features=id_score_list_features.to(device=device),
+        )
+        pg = dist.group.WORLD
+        outputs: List[SparseFeatures] = []
+        for fuse_features in [True, False]:
+            input_dist = VariableBatchRwSparseFeaturesDist(
+                # pyre-fixme[6]: For 1st param expected `ProcessGroup` but got
+                #  `Optional[ProcessGroup]`.
+                pg=pg,
+                num_id_list_features=len(id_list_features.keys()),
+                num_id_score_list_features=len(id_score_list_features.keys()),
+                id_list_feature_hash_sizes=[hash_size] * len(id_list_features.keys()),
+                id_score_list_feature_hash_sizes=[hash_size]
+                * len(id_score_list_features.keys()),
+                device=device,
+                fuse_features=fuse_features,
+            )
+            outputs.append(input_dist(sparse_features).wait().wait())
+        fused_output, output = outputs
+        assert fused_output.id_list_features is not None
+        assert output.id_list_features is not None
+        assert fused_output.id_score_list_features is not None
+        assert output.id_score_list_features is not None
+        KJTAllToAllTest._validate(
+            fused_output.id_list_features, output.id_list_features
+        )
+        KJTAllToAllTest._validate(
+            fused_output.id_score_list_features, output.id_score_list_features
+        )
+        dist.destroy_process_group()
+
+    @unittest.skipIf(
+        torch.cuda.device_count() <= 1,
+        "Not enough GPUs, this test requires at least two GPUs",
+    )
+    # pyre-fixme[56]
+    @given(
+        backend=st.sampled_from(["gloo", "nccl"]),
+        B=st.integers(min_value=1, max_value=2),
+        features=st.integers(min_value=1, max_value=4),
+        score_features=st.integers(min_value=1, max_value=4),
+    )
+    @settings(max_examples=4, deadline=None)
+    def test_fused_features(
+        self,
+        backend: str,
+        B: int,
+        features: int,
+        score_features: int,
+    ) -> None:
+        world_size = 2
+        batch_size_per_rank = [random.randint(B, B + 4) for _ in range(world_size)]
+        id_list_features, _ = _generate_sparse_features_batch(
+            keys=[f"F{feature}" for feature in range(features)],
+            splits=[features] + [0] * (world_size - 1),
+            batch_size_per_rank=batch_size_per_rank,
+        )
+        id_score_list_features, _ = _generate_sparse_features_batch(
+            keys=[f"S{feature}" for feature in range(score_features)],
+            splits=[score_features] + [0] * (world_size - 1),
+            batch_size_per_rank=batch_size_per_rank,
+            is_weighted=True,
+        )
+
+        kwargs_per_rank = []
+        for rank in range(world_size):
+            kwargs_per_rank.append(
+                {
+                    "id_list_features": id_list_features[rank],
+                    "id_score_list_features": id_score_list_features[rank],
+                    # values are generated in [0, 1000]
+                    "hash_size": 1001,
+                    "backend": backend,
+                }
+            )
+
+        self._run_multi_process_test_per_rank(
+            callable=self._run_test_fused_features,
+            world_size=world_size,
+            kwargs_per_rank=kwargs_per_rank,
+        )
+
+    @classmethod
+    def _run_test_bucketize_on_side_streams(
+        cls,
+        rank: int,
+        world_size: int,
+        id_list_features: KeyedJaggedTensor,
+        id_score_list_features: KeyedJaggedTensor,
+        hash_size: int,
+    ) -> None:
+        # no collective is issued, all ranks can share one GPU
+        dist.init_process_group(rank=rank, world_size=world_size, backend="gloo")
+        device = torch.device("cuda:0")
+        input_dist = VariableBatchRwSparseFeaturesDist(
+            # pyre-fixme[6]: For 1st param expected `ProcessGroup` but got
+            #  `Optional[ProcessGroup]`.
+            pg=dist.group.WORLD,
+            num_id_list_features=len(id_list_features.keys()),
+            num_id_score_list_features=len(id_score_list_features.keys()),
+            id_list_feature_hash_sizes=[hash_size] * len(id_list_features.keys()),
+            id_score_list_feature_hash_sizes=[hash_size]
+            * len(id_score_list_features.keys()),
+            device=device,
+        )
+        id_list_features = id_list_features.to(device=device)
+        id_score_list_features = id_score_list_features.to(device=device)
+        expected_id_list_features = input_dist._bucketize_id_list_features(
+            id_list_features
+        )
+        expected_id_score_list_features = input_dist._bucketize_id_score_list_features(
+            id_score_list_features
+        )
+
+        for offsets_only in [False, True]:
+            features = [
+                KeyedJaggedTensor(
+                    keys=kjt.keys(),
+                    values=kjt.values(),
+                    weights=kjt.weights_or_none(),
+                    offsets=kjt.offsets(),
+                    stride=kjt.stride(),
+                )
+                if offsets_only
+                else kjt
+                for kjt in [id_list_features, id_score_list_features]
+            ]
+            (
+                actual_id_list_features,
+                actual_id_score_list_features,
+            ) = input_dist._bucketize_on_side_streams(*features)
+            torch.cuda.synchronize(device)
+            assert keyed_jagged_tensor_equals(
+                actual_id_list_features, expected_id_list_features
+            )
+            assert keyed_jagged_tensor_equals(
+                actual_id_score_list_features, expected_id_score_list_features
+            )
+        dist.destroy_process_group()
+
+    @unittest.skipIf(
+        torch.cuda.device_count() <= 0,
+        "CUDA is not available",
+    )
+    def test_bucketize_on_side_streams(self) -> None:
+        world_size = 2
+        batch_size_per_rank = [random.randint(1, 5) for _ in range(world_size)]
+        id_list_features, _ = _generate_sparse_features_batch(
+            keys=[f"F{feature}" for feature in range(3)],
+            splits=[3] + [0] * (world_size - 1),
+            batch_size_per_rank=batch_size_per_rank,
+        )
+        id_score_list_features, _ = _generate_sparse_features_batch(
+            keys=[f"S{feature}" for feature in range(2)],
+            splits=[2] + [0] * (world_size - 1),
+            batch_size_per_rank=batch_size_per_rank,
+            is_weighted=True,
+        )
+
+        kwargs_per_rank = []
+        for rank in range(world_size):
+            kwargs_per_rank.append(
+                {
+                    "id_list_features": id_list_features[rank],
+                    "id_score_list_features": id_score_list_features[rank],
+                    # values are generated in [0, 1000]
+                    "hash_size": 1001,
+                }
+            )
+
+        self._run_multi_process_test_per_rank(
+            callable=self._run_test_bucketize_on_side_streams,
+            world_size=world_size,
+            kwargs_per_rank=kwargs_per_rank,
+        )
+
+    @classmethod
+    def _run_test_single_rank(
+        cls,
+        rank: int,
+        world_size: int,
+        id_list_features: KeyedJaggedTensor,
+        id_score_list_features: KeyedJaggedTensor,
+        hash_size: int,
+    ) -> None:
+        dist.init_process_group(rank=rank, world_size=world_size, backend="gloo")
+        # bucketizing id list positions sets the weights to the position of each
+        # value in its bag
+        positions = torch.cat(
+            [torch.arange(length) for length in id_list_features.lengths().tolist()]
+        )
+        sparse_features = SparseFeatures(
+            id_list_features=id_list_features,
+            id_score_list_features=id_score_list_features,
+        )
+        for has_feature_processor in [False, True]:
+            input_dist = VariableBatchRwSparseFeaturesDist(
+                # pyre-fixme[6]: For 1st param expected `ProcessGroup` but got
+                #  `Optional[ProcessGroup]`.
+                pg=dist.group.WORLD,
+                num_id_list_features=len(id_list_features.keys()),
+                num_id_score_list_features=len(id_score_list_features.keys()),
+                id_list_feature_hash_sizes=[hash_size] * len(id_list_features.keys()),
+                id_score_list_feature_hash_sizes=[hash_size]
+                * len(id_score_list_features.keys()),
+                device=torch.device("cpu"),
+                has_feature_processor=has_feature_processor,
+                fuse_features=True,
+            )
+            # block sizes are only needed to bucketize id list positions
+            assert (
+                hasattr(input_dist, "_id_list_feature_block_sizes_tensor")
+                == has_feature_processor
+            )
+            assert not hasattr(input_dist, "_id_score_list_feature_block_sizes_tensor")
+            assert not hasattr(input_dist, "_feature_block_sizes_tensor")
+
+            output = input_dist(sparse_features).wait().wait()
+            expected_id_list_features = (
+                KeyedJaggedTensor.from_lengths_sync(
+                    keys=id_list_features.keys(),
+                    values=id_list_features.values(),
+                    weights=positions,
+                    lengths=id_list_features.lengths(),
+                )
+                if has_feature_processor
+                else id_list_features
+            )
+            assert output.id_list_features is not None
+            assert output.id_score_list_features is not None
+            KJTAllToAllTest._validate(
+                output.id_list_features, expected_id_list_features
+            )
+            KJTAllToAllTest._validate(
+                output.id_score_list_features, id_score_list_features
+            )
+        dist.destroy_process_group()
+
+    def test_single_rank(self) -> None:
+        id_list_features, _ = _generate_sparse_features_batch(
+            keys=[f"F{feature}" for feature in range(3)],
+            splits=[3],
+            batch_size_per_rank=[4],
+        )
+        id_score_list_features, _ = _generate_sparse_features_batch(
+            keys=[f"S{feature}" for feature in range(2)],
+            splits=[2],
+            batch_size_per_rank=[4],
+            is_weighted=True,
+        )
+        self._run_multi_process_test(
+            callable=self._run_test_single_rank,
+            world_size=1,
+            id_list_features=id_list_features[0],
+            id_score_list_features=id_score_list_features[0],
+            # values are generated in [0, 1000]
+            hash_size=1001,
+        )
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+import unittest
+
+import torch
+from torchrec.distributed.sharding.vb_sharding import VariableBatchShardingContext
+
+
+class VariableBatchShardingContextTest(unittest.TestCase):
+    def test_batch_size_per_rank(self) -> None:
+        ctx = VariableBatchShardingContext(
+            batch_size_per_rank=[2, 3],
+            batch_size_per_rank_tensor=torch.tensor([4, 5]),
+        )
+        self.assertEqual(ctx.get_batch_size_per_rank(), [2, 3])
+
+    def test_batch_size_per_rank_from_tensor(self) -> None:
+        ctx = VariableBatchShardingContext(
+            batch_size_per_rank_tensor=torch.tensor([4, 5], dtype=torch.int32)
+        )
+        batch_size_per_rank = ctx.get_batch_size_per_rank()
+        self.assertEqual(batch_size_per_rank, [4, 5])
+        # the host copy is cached, the public field is left untouched
+        self.assertIs(ctx.get_batch_size_per_rank(), batch_size_per_rank)
+        self.assertEqual(ctx.batch_size_per_rank, [])
+
+        ctx.batch_size_per_rank_tensor = torch.tensor([6, 7, 8], dtype=torch.int32)
+        self.assertEqual(ctx.get_batch_size_per_rank(), [6, 7, 8])
+
+    def test_empty(self) -> None:
+        self.assertEqual(VariableBatchShardingContext().get_batch_size_per_rank(), [])